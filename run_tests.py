@@ -20,10 +20,17 @@ def main():
     
     # Handle any command line arguments
     args = sys.argv[1:]
-    
-    # Default arguments if none provided
+
+    # Allow disabling parallel workers for debugging
+    no_parallel = "--no-parallel" in args
+    args = [arg for arg in args if arg != "--no-parallel"]
+
+    # Default arguments if none provided: skip the on-disk pytest cache and
+    # stdout capture, and spread tests across cores via pytest-xdist
     if not args:
-        args = ["-v", "tests"]
+        args = ["-v", "-p", "no:cacheprovider", "--capture=no", "tests"]
+        if not no_parallel:
+            args[1:1] = ["-n", "auto"]
     
     # Add pytest-specific arguments like -xvs for more verbose output
     if all(arg.startswith('-') or os.path.exists(arg) for arg in args):
@@ -4,7 +4,7 @@
 import asyncio
 import json
 import sys
-from typing import Optional, Any
+from typing import Any, Optional, Union
 
 from mcp.server.fastmcp import FastMCP
 
@@ -264,11 +264,18 @@ def search_repository(repository: str, query: str) -> str:
 
 
 # For testing compatibility with JSON-RPC, implement a stdio handler
-async def handle_jsonrpc_request(request_str: str) -> str:
-    """Handle a JSON-RPC request for testing purposes."""
+async def handle_jsonrpc_request(request_str: Union[str, dict]) -> str:
+    """Handle a JSON-RPC request for testing purposes.
+
+    Accepts either a serialized JSON string or an already-parsed dict, so
+    in-process callers can skip a serialize/parse round-trip.
+    """
     try:
-        # Parse the request
-        request = json.loads(request_str)
+        # Parse the request if it is not already a dict
+        if isinstance(request_str, dict):
+            request = request_str
+        else:
+            request = json.loads(request_str)
         method = request.get("method")
         request_id = request.get("id")
         
@@ -32,6 +32,9 @@ class Config:
 
         # GitHub settings
         self.github_token: Optional[str] = os.getenv("GITHUB_TOKEN")
+        # How to fetch repository contents: "api" (GitHub contents API) or
+        # "git" (shallow bare clone via the git CLI)
+        self.fetch_mode: str = os.getenv("REPOSEARCH_FETCH_MODE", "api")
 
         # Storage settings
         self.data_dir: Path = Path(os.getenv("DATA_DIR", "data"))
@@ -51,6 +54,11 @@ class Config:
         self.chunk_size: int = int(os.getenv("CHUNK_SIZE", "1000"))
         self.chunk_overlap: int = int(os.getenv("CHUNK_OVERLAP", "100"))
 
+        # Logging settings
+        self.verbose: bool = os.getenv("REPOSEARCH_VERBOSE", "").lower() in (
+            "1", "true", "yes"
+        )
+
         # Search settings
         self.max_results: int = int(os.getenv("MAX_RESULTS", "10"))
         self.score_threshold: float = float(os.getenv("SCORE_THRESHOLD", "0.0"))
@@ -65,12 +73,14 @@ class Config:
             "gemini_api_key": "***" if self.gemini_api_key else "",
             "openai_api_key": "***" if self.openai_api_key else "",
             "github_token": "***" if self.github_token else None,
+            "fetch_mode": self.fetch_mode,
             "data_dir": str(self.data_dir),
             "db_path": str(self.db_path),
             "embedding_model": self.embedding_model,
             "embedding_batch_size": str(self.embedding_batch_size),
             "chunk_size": str(self.chunk_size),
             "chunk_overlap": str(self.chunk_overlap),
+            "verbose": str(self.verbose),
             "max_results": str(self.max_results),
             "score_threshold": str(self.score_threshold),
         }
@@ -2,7 +2,7 @@
 
 import abc
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Set, Union
 
 from repo_search.models import DocumentChunk, RepositoryInfo, SearchResult
 
@@ -23,6 +23,45 @@ class VectorDatabase(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def store_chunks_with_vectors(
+        self, chunks: List[DocumentChunk], vectors: List[List[float]]
+    ) -> None:
+        """Store document chunks with pre-computed embedding vectors.
+
+        Args:
+            chunks: List of document chunks to store.
+            vectors: Embedding vectors, one per chunk.
+        """
+        pass
+
+    @abc.abstractmethod
+    def get_existing_content_hashes(
+        self, repository_name: str, hashes: Iterable[str]
+    ) -> Set[str]:
+        """Get the subset of content hashes already stored for a repository.
+
+        Args:
+            repository_name: Repository name in the format 'owner/name'.
+            hashes: Content hashes to look up.
+
+        Returns:
+            Set of hashes that already have stored vectors.
+        """
+        pass
+
+    @abc.abstractmethod
+    def copy_chunk_vectors(
+        self, repository_name: str, chunks: List[DocumentChunk]
+    ) -> None:
+        """Store chunks by reusing vectors of stored chunks with the same content hash.
+
+        Args:
+            repository_name: Repository name in the format 'owner/name'.
+            chunks: Chunks whose metadata 'content_hash' matches an existing chunk.
+        """
+        pass
+
     @abc.abstractmethod
     def search(
         self,
@@ -122,6 +161,21 @@ class VectorDatabase(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def delete_file_chunks_bulk(
+        self, repository_name: str, file_paths: Iterable[str]
+    ) -> None:
+        """Delete all chunks for a set of files in one database operation.
+
+        This is used when several files have been modified or deleted and
+        their chunks need to be removed or replaced.
+
+        Args:
+            repository_name: Repository name in the format 'owner/name'.
+            file_paths: Paths of the files within the repository.
+        """
+        pass
+
     @abc.abstractmethod
     def clear(self) -> None:
         """Clear all data from the database."""
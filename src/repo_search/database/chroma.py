@@ -4,7 +4,7 @@ import datetime
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Set, Union
 
 import chromadb
 from chromadb.config import Settings
@@ -12,10 +12,17 @@ from chromadb.utils import embedding_functions
 
 from repo_search.config import config
 from repo_search.database.base import VectorDatabase
+from repo_search.database.file_hash_store import FileHashStore
 from repo_search.embedding.openai import OpenAIEmbedder
 from repo_search.models import DocumentChunk, RepositoryInfo, SearchResult
 
 
+# Repository metadata documents are only ever fetched by id, never
+# searched, so a fixed placeholder vector avoids running an embedding
+# function over them on every metadata write
+_METADATA_EMBEDDING = [1.0]
+
+
 class ChromaVectorDatabase(VectorDatabase):
     """ChromaDB implementation of the vector database interface."""
 
@@ -23,6 +30,7 @@ class ChromaVectorDatabase(VectorDatabase):
         self,
         db_path: Path,
         embedder: Optional[OpenAIEmbedder] = None,
+        in_memory: bool = False,
     ) -> None:
         """Initialize the ChromaDB vector database.
 
@@ -30,20 +38,30 @@ class ChromaVectorDatabase(VectorDatabase):
             db_path: Path to the database directory.
             embedder: Embedder to use for generating embeddings. If None, embeddings
                 must be pre-computed.
+            in_memory: If True, use an ephemeral in-memory client instead of
+                persisting to disk. Intended for tests.
         """
         self.db_path = db_path or config.db_path
         self.embedder = embedder
 
         # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(
-            path=str(self.db_path),
-            settings=Settings(anonymized_telemetry=False)
-        )
+        if in_memory:
+            self.client = chromadb.EphemeralClient(
+                settings=Settings(anonymized_telemetry=False)
+            )
+        else:
+            self.client = chromadb.PersistentClient(
+                path=str(self.db_path),
+                settings=Settings(anonymized_telemetry=False)
+            )
 
         # Create collections if they don't exist
         self.chunks_collection = self._get_or_create_collection("chunks")
         self.repositories_collection = self._get_or_create_collection("repositories")
 
+        # Per-file data lives in sidecar files, not in Chroma metadata
+        self.file_hash_store = FileHashStore(None if in_memory else self.db_path)
+
     def _get_or_create_collection(self, name: str) -> chromadb.Collection:
         """Get or create a collection.
 
@@ -165,14 +183,151 @@ class ChromaVectorDatabase(VectorDatabase):
                 else:
                     raise e
 
-        # Update repository chunk count
-        repositories = set(chunk.repository for chunk in chunks)
-        for repo in repositories:
-            repo_info = self.get_repository(repo)
-            if repo_info:
-                repo_info.num_chunks += sum(1 for chunk in chunks if chunk.repository == repo)
-                repo_info.last_indexed = datetime.datetime.now()
-                self.add_repository(repo_info)
+        # Repository metadata (chunk count, last_indexed, sidecar) is
+        # written once by the caller when indexing finishes; updating it
+        # here would rewrite the full record and sidecar on every batch
+
+    def store_chunks_with_vectors(
+        self, chunks: List[DocumentChunk], vectors: List[List[float]]
+    ) -> None:
+        """Store document chunks with pre-computed embedding vectors.
+
+        Args:
+            chunks: List of document chunks to store.
+            vectors: Embedding vectors, one per chunk.
+        """
+        if len(chunks) != len(vectors):
+            raise ValueError(
+                f"Number of chunks ({len(chunks)}) does not match "
+                f"number of vectors ({len(vectors)})."
+            )
+
+        embedded_chunks = []
+        for chunk, vector in zip(chunks, vectors):
+            embedded_chunk = chunk.model_copy()
+            embedded_chunk.embedding = vector
+            embedded_chunks.append(embedded_chunk)
+
+        self.store_chunks(embedded_chunks)
+
+    def get_existing_content_hashes(
+        self, repository_name: str, hashes: Iterable[str]
+    ) -> Set[str]:
+        """Get the subset of content hashes already stored for a repository.
+
+        Args:
+            repository_name: Repository name in the format 'owner/name'.
+            hashes: Content hashes to look up.
+
+        Returns:
+            Set of hashes that already have stored vectors.
+        """
+        hashes = [h for h in hashes if h]
+        if not hashes:
+            return set()
+
+        result = self.chunks_collection.get(
+            where={
+                "$and": [
+                    {"repository": repository_name},
+                    {"content_hash": {"$in": hashes}},
+                ]
+            },
+            include=["metadatas"],
+        )
+
+        if not result["ids"]:
+            return set()
+
+        return {
+            metadata.get("content_hash")
+            for metadata in result["metadatas"]
+            if metadata.get("content_hash")
+        }
+
+    def get_file_chunk_vectors(
+        self, repository_name: str, file_paths: Iterable[str]
+    ) -> Dict[str, List[float]]:
+        """Get stored vectors keyed by content hash for chunks of the given files.
+
+        This is used to snapshot vectors before a set of files' chunks are
+        deleted, so unchanged chunks of modified files can reuse them
+        instead of being re-embedded.
+
+        Args:
+            repository_name: Repository name in the format 'owner/name'.
+            file_paths: Paths of the files within the repository.
+
+        Returns:
+            Mapping of content hash to one stored vector per hash.
+        """
+        file_paths = [file_path for file_path in file_paths if file_path]
+        if not file_paths:
+            return {}
+
+        result = self.chunks_collection.get(
+            where={
+                "$and": [
+                    {"repository": repository_name},
+                    {"file_path": {"$in": file_paths}},
+                ]
+            },
+            include=["metadatas", "embeddings"],
+        )
+
+        vectors_by_hash = {}
+        for metadata, embedding in zip(result["metadatas"], result["embeddings"]):
+            content_hash = metadata.get("content_hash")
+            if content_hash and content_hash not in vectors_by_hash:
+                vectors_by_hash[content_hash] = list(embedding)
+        return vectors_by_hash
+
+    def copy_chunk_vectors(
+        self, repository_name: str, chunks: List[DocumentChunk]
+    ) -> None:
+        """Store chunks by reusing vectors of stored chunks with the same content hash.
+
+        Args:
+            repository_name: Repository name in the format 'owner/name'.
+            chunks: Chunks whose metadata 'content_hash' matches an existing chunk.
+        """
+        if not chunks:
+            return
+
+        hashes = list({chunk.metadata.get("content_hash") for chunk in chunks})
+        result = self.chunks_collection.get(
+            where={
+                "$and": [
+                    {"repository": repository_name},
+                    {"content_hash": {"$in": hashes}},
+                ]
+            },
+            include=["metadatas", "embeddings"],
+        )
+
+        # Map each content hash to one of its stored vectors
+        vectors_by_hash = {}
+        for metadata, embedding in zip(result["metadatas"], result["embeddings"]):
+            content_hash = metadata.get("content_hash")
+            if content_hash and content_hash not in vectors_by_hash:
+                vectors_by_hash[content_hash] = list(embedding)
+
+        reused_chunks = []
+        missing_chunks = []
+        for chunk in chunks:
+            vector = vectors_by_hash.get(chunk.metadata.get("content_hash"))
+            if vector is None:
+                missing_chunks.append(chunk)
+            else:
+                embedded_chunk = chunk.model_copy()
+                embedded_chunk.embedding = vector
+                reused_chunks.append(embedded_chunk)
+
+        if reused_chunks:
+            self.store_chunks(reused_chunks)
+        if missing_chunks:
+            # Vectors disappeared between lookup and copy; embed them normally
+            self.store_chunks(missing_chunks)
 
     def search(
         self,
@@ -297,7 +452,8 @@ class ChromaVectorDatabase(VectorDatabase):
                 last_indexed = None
                 if "last_indexed" in repo_data and repo_data["last_indexed"]:
                     last_indexed = datetime.datetime.fromisoformat(repo_data["last_indexed"])
-                
+                sidecar = self.file_hash_store.get(repo_id)
+
                 repositories.append(
                     RepositoryInfo(
                         owner=metadata["owner"],
@@ -307,9 +463,13 @@ class ChromaVectorDatabase(VectorDatabase):
                         num_files=repo_data.get("num_files", 0),
                         num_chunks=repo_data.get("num_chunks", 0),
                         commit_hash=repo_data.get("commit_hash"),
+                        tree_hash=repo_data.get("tree_hash"),
+                        head_etag=repo_data.get("head_etag"),
                         download_successful=repo_data.get("download_successful", False),
                         chunking_successful=repo_data.get("chunking_successful", False),
                         embedding_successful=repo_data.get("embedding_successful", False),
+                        file_hashes=sidecar.get("file_hashes", {}),
+                        is_text_cache=sidecar.get("is_text_cache", {}),
                     )
                 )
             except Exception as e:
@@ -332,11 +492,21 @@ class ChromaVectorDatabase(VectorDatabase):
             "num_chunks": repository_info.num_chunks,
             "last_indexed": repository_info.last_indexed.isoformat() if repository_info.last_indexed else None,
             "commit_hash": repository_info.commit_hash,
+            "tree_hash": repository_info.tree_hash,
+            "head_etag": repository_info.head_etag,
             "download_successful": repository_info.download_successful,
             "chunking_successful": repository_info.chunking_successful,
             "embedding_successful": repository_info.embedding_successful,
         }
-        
+
+        # Per-file maps go to the sidecar store, keeping repository
+        # metadata writes O(1) in repository size
+        if repository_info.file_hashes or repository_info.is_text_cache:
+            self.file_hash_store.put(repo_id, {
+                "file_hashes": repository_info.file_hashes,
+                "is_text_cache": repository_info.is_text_cache,
+            })
+
         # Check if the repository already exists
         existing = self.repositories_collection.get(
             ids=[repo_id],
@@ -353,6 +523,7 @@ class ChromaVectorDatabase(VectorDatabase):
                     "full_name": repository_info.full_name,
                 }],
                 documents=[json.dumps(repository_data)],
+                embeddings=[_METADATA_EMBEDDING],
             )
         else:
             # Add new repository
@@ -364,6 +535,7 @@ class ChromaVectorDatabase(VectorDatabase):
                     "full_name": repository_info.full_name,
                 }],
                 documents=[json.dumps(repository_data)],
+                embeddings=[_METADATA_EMBEDDING],
             )
 
     def get_repository(self, repository_name: str) -> Optional[RepositoryInfo]:
@@ -389,7 +561,8 @@ class ChromaVectorDatabase(VectorDatabase):
             last_indexed = None
             if "last_indexed" in repo_data and repo_data["last_indexed"]:
                 last_indexed = datetime.datetime.fromisoformat(repo_data["last_indexed"])
-            
+            sidecar = self.file_hash_store.get(repository_name)
+
             return RepositoryInfo(
                 owner=metadata["owner"],
                 name=metadata["name"],
@@ -398,9 +571,13 @@ class ChromaVectorDatabase(VectorDatabase):
                 num_files=repo_data.get("num_files", 0),
                 num_chunks=repo_data.get("num_chunks", 0),
                 commit_hash=repo_data.get("commit_hash"),
+                tree_hash=repo_data.get("tree_hash"),
+                head_etag=repo_data.get("head_etag"),
                 download_successful=repo_data.get("download_successful", False),
                 chunking_successful=repo_data.get("chunking_successful", False),
                 embedding_successful=repo_data.get("embedding_successful", False),
+                file_hashes=sidecar.get("file_hashes", {}),
+                is_text_cache=sidecar.get("is_text_cache", {}),
             )
         except Exception as e:
             print(f"Error parsing repository data: {e}")
@@ -423,9 +600,10 @@ class ChromaVectorDatabase(VectorDatabase):
         # Delete all chunks for the repository
         self.delete_repository_chunks(repository_name)
         
-        # Delete the repository info
+        # Delete the repository info and its file hash sidecar
         self.repositories_collection.delete(ids=[repository_name])
-        
+        self.file_hash_store.delete(repository_name)
+
         return True
         
     def delete_repository_chunks(self, repository_name: str) -> None:
@@ -459,6 +637,33 @@ class ChromaVectorDatabase(VectorDatabase):
         )
         print(f"Deleted chunks for file {file_path} in repository {repository_name}")
 
+    def delete_file_chunks_bulk(
+        self, repository_name: str, file_paths: Iterable[str]
+    ) -> None:
+        """Delete all chunks for a set of files in one database operation.
+
+        This is used when several files have been modified or deleted and
+        their chunks need to be removed or replaced.
+
+        Args:
+            repository_name: Repository name in the format 'owner/name'.
+            file_paths: Paths of the files within the repository.
+        """
+        file_paths = list(file_paths)
+        if not file_paths:
+            return
+
+        # Delete chunks for all the files in a single round-trip
+        self.chunks_collection.delete(
+            where={
+                "$and": [
+                    {"repository": repository_name},
+                    {"file_path": {"$in": file_paths}},
+                ]
+            }
+        )
+        print(f"Deleted chunks for {len(file_paths)} files in repository {repository_name}")
+
     def clear(self) -> None:
         """Clear all data from the database."""
         # Delete and recreate collections
@@ -0,0 +1,93 @@
+"""Sidecar storage for per-repository file hashes."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class FileHashStore:
+    """Stores per-repository file hashes in sidecar JSON files.
+
+    File hashes are a dict with one entry per repository file, which is too
+    large to keep re-serializing into Chroma metadata on every repository
+    write. Each repository gets its own JSON file, written once per index
+    run via an atomic rename.
+    """
+
+    def __init__(self, base_path: Optional[Path] = None) -> None:
+        """Initialize the file hash store.
+
+        Args:
+            base_path: Directory to store the sidecar files under. If None,
+                hashes are kept in memory only (useful for tests).
+        """
+        self.base_path = Path(base_path) / "file_hashes" if base_path else None
+        self._memory: Dict[str, Dict] = {}
+
+    def _path_for(self, repository_name: str) -> Path:
+        """Get the sidecar path for a repository.
+
+        Args:
+            repository_name: Repository name in the format 'owner/name'.
+
+        Returns:
+            Path to the repository's sidecar file.
+        """
+        return self.base_path / f"{repository_name.replace('/', '__')}.json"
+
+    def get(self, repository_name: str) -> Dict:
+        """Get the stored data for a repository.
+
+        Args:
+            repository_name: Repository name in the format 'owner/name'.
+
+        Returns:
+            The stored dict, or an empty dict if nothing is stored.
+        """
+        if self.base_path is None:
+            return self._memory.get(repository_name, {})
+        try:
+            with open(self._path_for(repository_name), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error reading file hashes for {repository_name}: {e}")
+            return {}
+
+    def put(self, repository_name: str, data: Dict) -> None:
+        """Store data for a repository.
+
+        Args:
+            repository_name: Repository name in the format 'owner/name'.
+            data: Dict to store.
+        """
+        if self.base_path is None:
+            self._memory[repository_name] = data
+            return
+        try:
+            self.base_path.mkdir(exist_ok=True, parents=True)
+            # Write to a temp file and rename so readers never see a
+            # partially written sidecar
+            fd, tmp_path = tempfile.mkstemp(dir=self.base_path, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._path_for(repository_name))
+        except Exception as e:
+            print(f"Error writing file hashes for {repository_name}: {e}")
+
+    def delete(self, repository_name: str) -> None:
+        """Delete the stored data for a repository.
+
+        Args:
+            repository_name: Repository name in the format 'owner/name'.
+        """
+        if self.base_path is None:
+            self._memory.pop(repository_name, None)
+            return
+        try:
+            self._path_for(repository_name).unlink(missing_ok=True)
+        except Exception as e:
+            print(f"Error deleting file hashes for {repository_name}: {e}")
@@ -0,0 +1,94 @@
+"""Deterministic fake embedder for test mode."""
+
+import hashlib
+from typing import List, Optional
+
+from repo_search.config import config
+from repo_search.models import DocumentChunk
+
+# Dimensionality of the fake vectors; small to keep test runs fast
+FAKE_EMBEDDING_DIM = 64
+
+
+class FakeEmbedder:
+    """Generates deterministic embeddings without any network calls.
+
+    Vectors are derived from a hash of the input text, so identical texts
+    always map to identical vectors and the indexing pipeline behaves the
+    same way it does with a real embedder. Intended for test mode
+    (REPOSEARCH_TEST); mirrors the OpenAIEmbedder interface.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model_name: Optional[str] = None,
+        batch_size: Optional[int] = None,
+    ) -> None:
+        """Initialize the fake embedder.
+
+        Args:
+            api_key: Ignored; accepted for interface compatibility.
+            model_name: Ignored; accepted for interface compatibility.
+            batch_size: Number of texts per batch. If None, will use the batch
+                size from config.
+        """
+        self.api_key = api_key
+        self.model_name = model_name or "fake-embedding"
+        self.batch_size = batch_size or config.embedding_batch_size
+
+    def embed_text(self, text: str) -> List[float]:
+        """Generate a deterministic embedding for a single text.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            Embedding vector.
+        """
+        digest = hashlib.blake2b(
+            text.encode("utf-8"), digest_size=FAKE_EMBEDDING_DIM
+        ).digest()
+        # Map each byte to [-1, 1]
+        return [byte / 127.5 - 1.0 for byte in digest]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate deterministic embeddings for a batch of texts.
+
+        Args:
+            texts: List of texts to embed.
+
+        Returns:
+            List of embedding vectors, one per input text.
+        """
+        return [self.embed_text(text) for text in texts]
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Generate deterministic embeddings for multiple texts.
+
+        Args:
+            texts: List of texts to embed.
+
+        Returns:
+            List of embedding vectors.
+        """
+        return self.embed_batch(texts)
+
+    def embed_chunks(
+        self, chunks: List[DocumentChunk], show_progress: bool = True
+    ) -> List[DocumentChunk]:
+        """Generate deterministic embeddings for document chunks.
+
+        Args:
+            chunks: List of document chunks to embed.
+            show_progress: Ignored; accepted for interface compatibility.
+
+        Returns:
+            List of document chunks with embeddings.
+        """
+        embedded_chunks = []
+        for chunk in chunks:
+            embedded = chunk.model_copy()
+            embedded.embedding = self.embed_text(chunk.content)
+            embedded_chunks.append(embedded)
+        return embedded_chunks
@@ -1,5 +1,7 @@
 """OpenAI embedding functionality for RepoSearch."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Union
 
 import openai
@@ -52,6 +54,79 @@ class OpenAIEmbedder:
         )
         return response.data[0].embedding
 
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for a batch of texts.
+
+        Batches that fit within batch_size are embedded with a single API
+        call; larger batches are split into sub-batches that are embedded
+        concurrently, so wall time is bounded by the slowest request rather
+        than the sum of sequential round-trips.
+
+        Args:
+            texts: List of texts to embed.
+
+        Returns:
+            List of embedding vectors, one per input text.
+        """
+        if len(texts) > self.batch_size:
+            batches = [
+                texts[i:i + self.batch_size]
+                for i in range(0, len(texts), self.batch_size)
+            ]
+            results = self._run_async(self.embed_batches_async(batches))
+            return [embedding for batch in results for embedding in batch]
+
+        response = self.client.embeddings.create(
+            model=self.model_name,
+            input=texts,
+        )
+        return [item.embedding for item in response.data]
+
+    @staticmethod
+    def _run_async(coro):
+        """Run a coroutine to completion from synchronous code.
+
+        asyncio.run() raises if the caller is already inside a running
+        event loop — which happens when the MCP server invokes indexing
+        from an async handler — so in that case the coroutine runs on its
+        own loop in a worker thread instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
+
+    async def embed_batches_async(
+        self, batches: List[List[str]], concurrency: int = 8
+    ) -> List[List[List[float]]]:
+        """Embed multiple batches of texts with concurrent API calls.
+
+        Args:
+            batches: List of text batches, each within API limits.
+            concurrency: Maximum number of in-flight API requests.
+
+        Returns:
+            List of embedding lists, one per input batch, in input order.
+        """
+        client = openai.AsyncOpenAI(api_key=self.api_key)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def embed_one(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                response = await client.embeddings.create(
+                    model=self.model_name,
+                    input=batch,
+                )
+                return [item.embedding for item in response.data]
+
+        try:
+            return await asyncio.gather(*(embed_one(batch) for batch in batches))
+        finally:
+            await client.close()
+
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts.
 
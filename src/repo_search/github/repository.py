@@ -1,6 +1,8 @@
 """GitHub repository handling functionality."""
 
 import os
+import shutil
+import subprocess
 import tempfile
 from pathlib import Path
 from typing import Dict, Iterator, List, Optional, Set, Tuple
@@ -13,6 +15,42 @@ from tqdm import tqdm
 from repo_search.config import config
 from repo_search.models import RepositoryInfo
 
+# Text extensions - be more specific to avoid processing non-text files
+_TEXT_EXTENSIONS = frozenset({
+    # Documentation
+    ".txt", ".md", ".rst", ".adoc", ".asciidoc",
+
+    # Web
+    ".html", ".htm", ".css", ".scss", ".sass", ".less",
+    ".js", ".jsx", ".ts", ".tsx", ".vue", ".svelte",
+
+    # Config
+    ".json", ".xml", ".yaml", ".yml", ".toml", ".ini", ".cfg", ".conf",
+    ".properties", ".env", ".gitignore", ".gitconfig", ".gitattributes",
+
+    # Code
+    ".py", ".java", ".c", ".cpp", ".h", ".hpp", ".cs", ".rb", ".php", ".go",
+    ".rs", ".swift", ".kt", ".scala", ".sh", ".bash", ".zsh", ".fish",
+    ".sql", ".graphql", ".proto", ".cmake", ".mk", ".Makefile",
+
+    # Structured data that should be reasonably sized
+    ".csv", ".tsv",
+})
+
+# Max file size for text files (5MB)
+_MAX_TEXT_FILE_SIZE = 5 * 1024 * 1024
+
+# Magic-number prefixes of common binary formats (PNG, zip/jar/docx, ELF,
+# JPEG, GIF, gzip, PDF-embedded object streams are caught by the NUL check)
+_BINARY_MAGIC = (
+    b"\x89PNG",
+    b"PK\x03\x04",
+    b"\x7fELF",
+    b"\xff\xd8\xff",
+    b"GIF8",
+    b"\x1f\x8b",
+)
+
 
 class GitHubRepositoryFetcher:
     """Fetches content from GitHub repositories."""
@@ -46,17 +84,68 @@ class GitHubRepositoryFetcher:
 
         try:
             repo = self.github.get_repo(repo_name)
-            # Get the latest commit hash
-            commit_hash = repo.get_commits()[0].sha
+            # Get the latest commit hash and the root tree hash of HEAD
+            commit = repo.get_commits()[0]
             return RepositoryInfo(
                 owner=owner,
                 name=name,
                 url=repo.html_url,
-                commit_hash=commit_hash,
+                commit_hash=commit.sha,
+                tree_hash=commit.commit.tree.sha,
             )
         except Exception as e:
             raise ValueError(f"Error accessing repository {repo_name}: {e}")
 
+    def get_repository_info_conditional(
+        self, repo_name: str, etag: Optional[str] = None
+    ) -> Optional[RepositoryInfo]:
+        """Get repository information using a conditional HTTP request.
+
+        Sends If-None-Match with the stored ETag, so the common
+        nothing-changed case is a single 304 response with no body.
+
+        Args:
+            repo_name: Repository name in the format 'owner/name'.
+            etag: ETag from a previous response, if any.
+
+        Returns:
+            Information about the repository, or None if an ETag was given
+            and the repository's HEAD has not changed (HTTP 304).
+
+        Raises:
+            ValueError: If the repository does not exist or is not accessible.
+        """
+        try:
+            owner, name = repo_name.split("/", 1)
+        except ValueError:
+            raise ValueError(f"Invalid repository name: {repo_name}. Expected format: owner/name")
+
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if etag:
+            headers["If-None-Match"] = etag
+        try:
+            response = requests.get(
+                f"https://api.github.com/repos/{owner}/{name}/commits/HEAD",
+                headers=headers,
+                timeout=30,
+            )
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+            data = response.json()
+            return RepositoryInfo(
+                owner=owner,
+                name=name,
+                url=f"https://github.com/{owner}/{name}",
+                commit_hash=data["sha"],
+                tree_hash=data["commit"]["tree"]["sha"],
+                head_etag=response.headers.get("ETag"),
+            )
+        except requests.RequestException as e:
+            raise ValueError(f"Error accessing repository {repo_name}: {e}")
+
     def fetch_repository_contents(
         self, repo_name: str, output_dir: Optional[Path] = None
     ) -> Tuple[RepositoryInfo, Path]:
@@ -178,65 +267,28 @@ class GitHubRepositoryFetcher:
         Returns:
             True if the file is a text file, False otherwise.
         """
-        # Text extensions - be more specific to avoid processing non-text files
-        text_extensions = {
-            # Documentation
-            ".txt", ".md", ".rst", ".adoc", ".asciidoc", 
-            
-            # Web
-            ".html", ".htm", ".css", ".scss", ".sass", ".less",
-            ".js", ".jsx", ".ts", ".tsx", ".vue", ".svelte",
-            
-            # Config
-            ".json", ".xml", ".yaml", ".yml", ".toml", ".ini", ".cfg", ".conf", 
-            ".properties", ".env", ".gitignore", ".gitconfig", ".gitattributes",
-            
-            # Code
-            ".py", ".java", ".c", ".cpp", ".h", ".hpp", ".cs", ".rb", ".php", ".go",
-            ".rs", ".swift", ".kt", ".scala", ".sh", ".bash", ".zsh", ".fish", 
-            ".sql", ".graphql", ".proto", ".cmake", ".mk", ".Makefile",
-            
-            # Structured data that should be reasonably sized
-            ".csv", ".tsv",
-        }
-        
-        # Max file size for text files (5MB)
-        MAX_TEXT_FILE_SIZE = 5 * 1024 * 1024
-        
         # Check file size first - large files are likely binary
-        if file_path.stat().st_size > MAX_TEXT_FILE_SIZE:
+        if file_path.stat().st_size > _MAX_TEXT_FILE_SIZE:
             print(f"Skipping large file (> 5MB): {file_path}")
             return False
-        
+
         # Check extension - only process files with known text extensions
         ext = file_path.suffix.lower()
-        if ext in text_extensions:
-            # Still try to read a small sample to confirm it's text
+        if ext in _TEXT_EXTENSIONS:
+            # Sniff only the first 32 bytes: enough to catch binary magic
+            # numbers and embedded NULs without reading the whole file
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    sample = f.read(1024)
-                    
-                    # Check for binary characters in the sample
-                    binary_chars = sum(1 for c in sample if ord(c) < 9 or (ord(c) > 13 and ord(c) < 32))
-                    if binary_chars > len(sample) * 0.1:  # More than 10% binary chars
-                        print(f"Skipping likely binary file despite text extension: {file_path}")
-                        return False
-                        
-                return True
-            except UnicodeDecodeError:
-                try:
-                    # Try one more encoding
-                    with open(file_path, "r", encoding="latin-1") as f:
-                        sample = f.read(1024)
-                        binary_chars = sum(1 for c in sample if ord(c) < 9 or (ord(c) > 13 and ord(c) < 32))
-                        if binary_chars > len(sample) * 0.1:
-                            return False
-                    return True
-                except:
-                    return False
+                with open(file_path, "rb") as f:
+                    head = f.read(32)
             except Exception:
                 return False
-        
+
+            if head.startswith(_BINARY_MAGIC) or b"\x00" in head:
+                print(f"Skipping likely binary file despite text extension: {file_path}")
+                return False
+
+            return True
+
         # By default, consider unknown extensions as non-text
         return False
 
@@ -252,3 +304,116 @@ class GitHubRepositoryFetcher:
         for file_path in directory.glob("**/*"):
             if file_path.is_file() and self.is_text_file(file_path):
                 yield file_path
+
+
+class BareGitFetcher(GitHubRepositoryFetcher):
+    """Fetches repository contents via a shallow bare git clone.
+
+    A bare clone transfers the packed objects in a single negotiation
+    instead of one API request per file; the tree is then materialized
+    locally by reading blobs out of the object store with
+    `git cat-file --batch`, which is far faster than downloading each
+    file through the GitHub contents API.
+    """
+
+    def _download_repository(self, repo_info: RepositoryInfo, output_dir: Path) -> None:
+        """Download the contents of a repository via a bare clone.
+
+        Args:
+            repo_info: Repository information.
+            output_dir: Directory where to store the repository contents.
+        """
+        clone_dir = output_dir / ".bare.git"
+        self._clone_bare(repo_info, clone_dir)
+        try:
+            print(f"Materializing files from bare clone of {repo_info.full_name}...")
+            successfully_downloaded = 0
+            if repo_info.file_hashes is None:
+                repo_info.file_hashes = {}
+            for rel_path, blob_sha, content in self.iter_files(clone_dir):
+                file_path = output_dir / rel_path
+                file_path.parent.mkdir(exist_ok=True, parents=True)
+                file_path.write_bytes(content)
+                # Blob SHAs match the hashes reported by the GitHub API
+                repo_info.file_hashes[rel_path] = blob_sha
+                successfully_downloaded += 1
+            repo_info.num_files = successfully_downloaded
+            print(f"Successfully materialized {successfully_downloaded} files")
+        finally:
+            shutil.rmtree(clone_dir, ignore_errors=True)
+
+    def _clone_bare(self, repo_info: RepositoryInfo, clone_dir: Path) -> None:
+        """Run a shallow bare clone of the repository.
+
+        Args:
+            repo_info: Repository information.
+            clone_dir: Directory for the bare clone.
+        """
+        url = f"https://github.com/{repo_info.full_name}.git"
+        cmd = ["git"]
+        env = None
+        if self.token:
+            # Feed the token to git through the environment via an inline
+            # credential helper so it never appears on the command line,
+            # which would leak it into CalledProcessError messages and logs
+            env = {**os.environ, "REPOSEARCH_GIT_PASSWORD": self.token}
+            helper = (
+                "!f() { echo username=x-access-token; "
+                'echo "password=$REPOSEARCH_GIT_PASSWORD"; }; f'
+            )
+            cmd += ["-c", f"credential.helper={helper}"]
+        cmd += ["clone", "--depth", "1", "--bare", url, str(clone_dir)]
+        subprocess.run(cmd, check=True, capture_output=True, env=env)
+
+    def iter_files(self, clone_dir: Path) -> Iterator[Tuple[str, str, bytes]]:
+        """Iterate over the files of a bare clone without a working tree.
+
+        Args:
+            clone_dir: Directory containing the bare clone.
+
+        Returns:
+            Iterator of (relative path, blob SHA, content) tuples.
+        """
+        entries = self._ls_tree(clone_dir)
+        # One long-lived cat-file process serves all blobs, avoiding a
+        # subprocess spawn per file
+        with subprocess.Popen(
+            ["git", "-C", str(clone_dir), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        ) as proc:
+            for rel_path, blob_sha in entries:
+                proc.stdin.write(f"{blob_sha}\n".encode())
+                proc.stdin.flush()
+                header = proc.stdout.readline().split()
+                if len(header) != 3 or header[1] != b"blob":
+                    print(f"Skipping non-blob object for {rel_path}")
+                    continue
+                size = int(header[2])
+                content = proc.stdout.read(size)
+                proc.stdout.read(1)  # trailing newline after each object
+                yield rel_path, blob_sha, content
+            proc.stdin.close()
+
+    def _ls_tree(self, clone_dir: Path) -> List[Tuple[str, str]]:
+        """List the blobs of HEAD in a bare clone.
+
+        Args:
+            clone_dir: Directory containing the bare clone.
+
+        Returns:
+            List of (relative path, blob SHA) tuples.
+        """
+        result = subprocess.run(
+            ["git", "-C", str(clone_dir), "ls-tree", "-r", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        entries = []
+        for line in result.stdout.splitlines():
+            meta, rel_path = line.split("\t", 1)
+            _mode, obj_type, sha = meta.split()
+            if obj_type == "blob":
+                entries.append((rel_path, sha))
+        return entries
@@ -16,10 +16,13 @@ class RepositoryInfo(BaseModel):
     num_files: int = 0
     num_chunks: int = 0
     commit_hash: Optional[str] = None
+    tree_hash: Optional[str] = None  # Root tree OID of HEAD; equal trees mean identical content
+    head_etag: Optional[str] = None  # ETag of the HEAD commit response, for conditional requests
     download_successful: bool = False
     chunking_successful: bool = False
     embedding_successful: bool = False
     file_hashes: Dict[str, str] = Field(default_factory=dict)  # Maps file paths to their SHA hashes
+    is_text_cache: Dict[str, bool] = Field(default_factory=dict)  # Maps file paths to text-file sniff results
 
     @property
     def full_name(self) -> str:
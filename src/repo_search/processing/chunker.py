@@ -3,7 +3,7 @@
 import re
 import uuid
 from pathlib import Path
-from typing import Dict, Iterator, List, Optional, Tuple, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from langchain.text_splitter import (
     RecursiveCharacterTextSplitter,
@@ -271,22 +271,25 @@ class RepositoryChunker:
         self.text_chunker = TextChunker(chunk_size, chunk_overlap)
 
     def chunk_repository(
-        self, repository: str, directory: Path
+        self, repository: str, directory: Path, files: Optional[Iterable[Path]] = None
     ) -> Iterator[DocumentChunk]:
         """Chunk all text files in a repository.
 
         Args:
             repository: Repository name in the format 'owner/name'.
             directory: Directory containing the repository contents.
+            files: Text files to chunk. If None, the directory is walked to
+                find them; passing a pre-computed list avoids a second walk.
 
         Yields:
             Document chunks.
         """
-        from repo_search.github.repository import GitHubRepositoryFetcher
+        if files is None:
+            from repo_search.github.repository import GitHubRepositoryFetcher
 
-        # Get all text files in the repository
-        repo_fetcher = GitHubRepositoryFetcher()
-        for file_path in repo_fetcher.get_text_files(directory):
+            # Get all text files in the repository
+            files = GitHubRepositoryFetcher().get_text_files(directory)
+        for file_path in files:
             try:
                 # Get the relative path within the repository
                 relative_path = file_path.relative_to(directory)
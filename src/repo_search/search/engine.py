@@ -1,18 +1,71 @@
 """Search engine for RepoSearch."""
 
 import datetime
+import os
 import shutil
+import tarfile
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
+
+import xxhash
 
 from repo_search.config import config
 from repo_search.database.base import VectorDatabase
 from repo_search.database.chroma import ChromaVectorDatabase
+from repo_search.embedding.fake import FakeEmbedder
 from repo_search.embedding.openai import OpenAIEmbedder
-from repo_search.github.repository import GitHubRepositoryFetcher
+from repo_search.github.repository import BareGitFetcher, GitHubRepositoryFetcher
 from repo_search.models import DocumentChunk, RepositoryInfo, SearchResult
-from repo_search.processing.chunker import RepositoryChunker
+from repo_search.processing.chunker import RepositoryChunker, TextChunker
+
+# Number of chunks to embed and store per OpenAI API call
+EMBED_BATCH_SIZE = 100
+
+# Number of commit-keyed repository tree caches to keep on disk
+REPO_CACHE_KEEP = 5
+
+# Per-process chunker, created lazily and reused across _chunk_one calls
+_process_chunker: Optional[TextChunker] = None
+
+
+def _chunk_one(file_path: Path, repository: str) -> List[DocumentChunk]:
+    """Chunk a single file.
+
+    Module-level so it is picklable for worker processes.
+
+    Args:
+        file_path: Path to the file.
+        repository: Repository name in the format 'owner/name'.
+
+    Returns:
+        List of document chunks.
+    """
+    global _process_chunker
+    if _process_chunker is None:
+        _process_chunker = TextChunker()
+    return _process_chunker.chunk_file(file_path, repository)
+
+
+def _batched(iterable: Iterable, n: int) -> Iterator[List]:
+    """Yield successive lists of up to n items from an iterable.
+
+    Args:
+        iterable: Items to batch.
+        n: Maximum number of items per batch.
+
+    Yields:
+        Lists of up to n items.
+    """
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == n:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
 class SearchEngine:
@@ -36,10 +89,21 @@ class SearchEngine:
         self.api_key = api_key or config.openai_api_key
         self.token = token or config.github_token
 
-        # Initialize components
-        self.embedder = OpenAIEmbedder(api_key=self.api_key)
-        self.db = ChromaVectorDatabase(db_path=self.db_path, embedder=self.embedder)
-        self.repo_fetcher = GitHubRepositoryFetcher(token=self.token)
+        # Initialize components. In test mode (REPOSEARCH_TEST), swap in a
+        # deterministic fake embedder and an in-memory database so no
+        # network or disk I/O happens
+        if os.environ.get("REPOSEARCH_TEST"):
+            self.embedder = FakeEmbedder()
+            self.db = ChromaVectorDatabase(
+                db_path=self.db_path, embedder=self.embedder, in_memory=True
+            )
+        else:
+            self.embedder = OpenAIEmbedder(api_key=self.api_key)
+            self.db = ChromaVectorDatabase(db_path=self.db_path, embedder=self.embedder)
+        if config.fetch_mode == "git":
+            self.repo_fetcher = BareGitFetcher(token=self.token)
+        else:
+            self.repo_fetcher = GitHubRepositoryFetcher(token=self.token)
         self.chunker = RepositoryChunker()
 
     def index_repository(
@@ -65,18 +129,47 @@ class SearchEngine:
         # For backwards compatibility, force_refresh overrides the other force flags
         if force_refresh:
             force_redownload = force_rechunk = force_reembed = True
+        # Check if the repository is already indexed
+        existing_repo = self.db.get_repository(repository)
+
         # First, get current repository info (with the latest commit hash)
         print(f"Checking repository {repository}...")
         try:
-            # This will fetch the latest repo info with commit hash
-            current_repo_info = self.repo_fetcher.get_repository_info(repository)
+            if existing_repo:
+                # Conditional request: a 304 means HEAD is exactly what we
+                # indexed, with no response body to download
+                current_repo_info = self.repo_fetcher.get_repository_info_conditional(
+                    repository, etag=existing_repo.head_etag
+                )
+                if current_repo_info is None:
+                    print(f"Repository {repository} is unchanged (HTTP 304).")
+                    current_repo_info = existing_repo
+            else:
+                # This will fetch the latest repo info with commit hash
+                current_repo_info = self.repo_fetcher.get_repository_info(repository)
         except Exception as e:
             print(f"Error getting repository info: {e}")
             raise
 
-        # Check if the repository is already indexed
-        existing_repo = self.db.get_repository(repository)
-        
+        # Cheapest exit first: if nothing is forced and the stored index is
+        # complete for this content, there is nothing to do
+        if self._can_short_circuit(
+            existing_repo, current_repo_info, force_redownload, force_rechunk, force_reembed
+        ):
+            print(f"Repository {repository} is already fully indexed and unchanged.")
+            print(f"Latest commit: {existing_repo.commit_hash}")
+            print(f"Last indexed: {existing_repo.last_indexed}")
+            print(f"Number of chunks: {existing_repo.num_chunks}")
+            # Persist a fresh ETag so the next check can get a 304
+            if (
+                current_repo_info is not existing_repo
+                and current_repo_info.head_etag
+                and current_repo_info.head_etag != existing_repo.head_etag
+            ):
+                existing_repo.head_etag = current_repo_info.head_etag
+                self.db.add_repository(existing_repo)
+            return existing_repo
+
         # Initialize repo_info with current info
         repo_info = current_repo_info
         repo_dir = None
@@ -87,6 +180,8 @@ class SearchEngine:
         # Track which files need processing at each stage
         files_to_chunk = set()
         files_to_delete = set()
+        text_files = None
+        reusable_vectors = None
         
         # If already indexed, check what steps we can skip
         if existing_repo:
@@ -138,10 +233,6 @@ class SearchEngine:
                     print(f"Repository {repository} has changed (commit {current_repo_info.commit_hash}).")
                     print(f"Previous commit: {existing_repo.commit_hash or 'unknown'}")
                 
-                # Copy over file hashes from existing repo for comparison later
-                if hasattr(existing_repo, 'file_hashes') and existing_repo.file_hashes:
-                    repo_info.file_hashes = existing_repo.file_hashes.copy()
-                
                 # Copy over non-commit-related metadata from existing repo
                 repo_info.num_chunks = existing_repo.num_chunks
                 repo_info.num_files = existing_repo.num_files
@@ -150,34 +241,64 @@ class SearchEngine:
         
         # Step 1: Download repository if needed
         if need_download:
-            # Create a temporary directory for the repository contents
-            temp_dir = tempfile.mkdtemp(prefix=f"reposearch_")
+            # Create a temporary directory for the repository contents,
+            # preferring a RAM-backed filesystem so chunking reads hit
+            # memory instead of disk
+            ram_dir = os.environ.get("REPOSEARCH_RAM_TMPDIR") or (
+                "/dev/shm" if os.path.isdir("/dev/shm") else None
+            )
             try:
-                # Fetch the repository contents
-                print(f"Fetching repository {repository}...")
-                downloaded_repo_info, repo_dir = self.repo_fetcher.fetch_repository_contents(
-                    repository, Path(temp_dir)
-                )
-                
+                temp_dir = tempfile.mkdtemp(prefix=f"reposearch_", dir=ram_dir)
+            except OSError:
+                # RAM-backed path unavailable or full - fall back to default
+                temp_dir = tempfile.mkdtemp(prefix=f"reposearch_")
+            try:
+                # On a forced re-download of an unchanged commit, rehydrate
+                # from the local commit cache instead of calling GitHub
+                repo_dir = None
+                if (
+                    force_redownload
+                    and existing_repo
+                    and existing_repo.commit_hash
+                    and existing_repo.commit_hash == current_repo_info.commit_hash
+                ):
+                    repo_dir = self._restore_repo_cache(
+                        existing_repo.commit_hash, Path(temp_dir)
+                    )
+                if repo_dir is not None:
+                    print(f"Restored repository {repository} from local commit cache.")
+                    downloaded_repo_info = existing_repo
+                else:
+                    # Fetch the repository contents
+                    print(f"Fetching repository {repository}...")
+                    downloaded_repo_info, repo_dir = self.repo_fetcher.fetch_repository_contents(
+                        repository, Path(temp_dir)
+                    )
+                    self._cache_repo_tree(current_repo_info.commit_hash, repo_dir)
+
+
                 # If we have existing file hashes, compare to identify changed files
                 if existing_repo and hasattr(existing_repo, 'file_hashes') and existing_repo.file_hashes:
                     # Get new file hashes from the downloaded repo
                     new_file_hashes = downloaded_repo_info.file_hashes
                     old_file_hashes = existing_repo.file_hashes
-                    
-                    # Find files that are new or modified
-                    for file_path, file_hash in new_file_hashes.items():
-                        if file_path not in old_file_hashes or old_file_hashes[file_path] != file_hash:
-                            # File is new or modified, needs processing
-                            files_to_chunk.add(file_path)
+
+                    # Diff the two hash maps with set algebra on the key views
+                    new_paths = new_file_hashes.keys()
+                    old_paths = old_file_hashes.keys()
+                    files_to_delete = set(old_paths - new_paths)
+                    files_to_chunk = set(new_paths - old_paths) | {
+                        file_path
+                        for file_path in new_paths & old_paths
+                        if new_file_hashes[file_path] != old_file_hashes[file_path]
+                    }
+                    if config.verbose:
+                        for file_path in sorted(files_to_chunk):
                             print(f"File changed or added: {file_path}")
-                    
-                    # Find files that were deleted
-                    for file_path in old_file_hashes:
-                        if file_path not in new_file_hashes:
-                            files_to_delete.add(file_path)
+                        for file_path in sorted(files_to_delete):
                             print(f"File deleted: {file_path}")
-                    
+
+
                     # If we have specific files to process, we need partial chunking
                     if files_to_chunk and not force_rechunk:
                         print(f"Detected {len(files_to_chunk)} changed files and {len(files_to_delete)} deleted files")
@@ -187,8 +308,13 @@ class SearchEngine:
                     print("No previous file hashes available, will process all files")
                     need_chunking = True
                     if repo_dir:
-                        # Get list of all files in the repository
-                        for file_path in self.repo_fetcher.get_text_files(repo_dir):
+                        # Walk the tree once; the same list feeds both the
+                        # change tracking and the chunker
+                        text_files = self._collect_text_files(
+                            repo_dir, existing_repo, repo_info,
+                            downloaded_repo_info.file_hashes,
+                        )
+                        for file_path in text_files:
                             rel_path = file_path.relative_to(repo_dir)
                             files_to_chunk.add(str(rel_path))
                 
@@ -198,89 +324,96 @@ class SearchEngine:
                 
                 # Update file hashes with the latest from GitHub
                 repo_info.file_hashes = downloaded_repo_info.file_hashes
-                
-                # Store repository info (partial update)
-                self.db.add_repository(repo_info)
             except Exception as e:
                 print(f"Error downloading repository: {e}")
                 repo_info.download_successful = False
                 self.db.add_repository(repo_info)
                 raise
         
-        # Step 2: Chunk repository if needed
-        chunks = []
+        # Step 2: Prepare the chunk stream if needed
+        chunk_iter = None
         if need_chunking and repo_dir:
             # If we have specific files to chunk
             if files_to_chunk and not force_rechunk:
                 print(f"Chunking {len(files_to_chunk)} changed/new files...")
-                try:
-                    # Delete chunks for deleted files
-                    if files_to_delete:
-                        print(f"Removing chunks for {len(files_to_delete)} deleted files...")
-                        for file_path in files_to_delete:
-                            self.db.delete_file_chunks(repository, file_path)
-                    
-                    # Chunk only the changed files
-                    for file_path in files_to_chunk:
-                        file_full_path = repo_dir / file_path
-                        # Check if file exists (might have been deleted)
-                        if file_full_path.exists() and file_full_path.is_file():
-                            # Remove existing chunks for this file
-                            self.db.delete_file_chunks(repository, file_path)
-                            
-                            # Check if it's a text file
-                            if self.repo_fetcher.is_text_file(file_full_path):
-                                # Chunk the file
-                                print(f"Chunking file: {file_path}")
-                                file_chunks = self.chunker.text_chunker.chunk_file(file_full_path, repository)
-                                chunks.extend(file_chunks)
-                    
-                    print(f"Generated {len(chunks)} chunks from changed files.")
-                    repo_info.chunking_successful = True
-                    self.db.add_repository(repo_info)
-                except Exception as e:
-                    print(f"Error chunking changed files: {e}")
-                    repo_info.chunking_successful = False
-                    self.db.add_repository(repo_info)
-                    if not isinstance(e, UnicodeDecodeError):  # UnicodeDecodeError is expected for some files
-                        raise
+                # Remove chunks for deleted and changed files in one
+                # bulk operation instead of one delete per file, but first
+                # snapshot their stored vectors so unchanged chunks of
+                # modified files can reuse them instead of re-embedding
+                paths_to_clear = files_to_delete | files_to_chunk
+                reusable_vectors = self.db.get_file_chunk_vectors(
+                    repository, paths_to_clear
+                )
+                if files_to_delete:
+                    print(f"Removing chunks for {len(files_to_delete)} deleted files...")
+                self.db.delete_file_chunks_bulk(repository, paths_to_clear)
+
+                # Sniff each changed file once; files carried over from the
+                # previous run keep their cached verdict, and verdicts
+                # already computed this run (the fresh-index walk) are
+                # reused rather than re-sniffed or dropped
+                is_text = dict(existing_repo.is_text_cache) if existing_repo else {}
+                for file_path in files_to_delete:
+                    is_text.pop(file_path, None)
+                fresh_verdicts = repo_info.is_text_cache
+                is_text.update(fresh_verdicts)
+                for file_path in files_to_chunk:
+                    file_full_path = repo_dir / file_path
+                    # Check if file exists (might have been deleted)
+                    if file_full_path.exists() and file_full_path.is_file():
+                        if file_path not in fresh_verdicts:
+                            is_text[file_path] = self.repo_fetcher.is_text_file(file_full_path)
+                    else:
+                        is_text.pop(file_path, None)
+                repo_info.is_text_cache = is_text
+
+                chunk_iter = self._chunk_changed_files(
+                    repository, repo_dir, files_to_chunk, is_text
+                )
             else:
                 # Process all files
                 print(f"Chunking all repository contents...")
-                try:
-                    # Delete all existing chunks
-                    if existing_repo:
-                        self.db.delete_repository_chunks(repository)
-                    
-                    # Chunk all files
-                    for chunk in self.chunker.chunk_repository(repository, repo_dir):
-                        chunks.append(chunk)
-                    print(f"Generated {len(chunks)} chunks.")
-                    repo_info.chunking_successful = True
-                    self.db.add_repository(repo_info)
-                except Exception as e:
-                    print(f"Error chunking repository: {e}")
-                    repo_info.chunking_successful = False
-                    self.db.add_repository(repo_info)
-                    if not isinstance(e, UnicodeDecodeError):  # UnicodeDecodeError is expected for some files
-                        raise
-        
-        # Step 3: Embed and store chunks if needed
-        if need_embedding and (chunks or not need_chunking):
+                # Delete all existing chunks
+                if existing_repo:
+                    self.db.delete_repository_chunks(repository)
+                if text_files is None:
+                    # Forced full re-chunk: reuse cached text-file verdicts
+                    # for files whose content hash is unchanged
+                    text_files = self._collect_text_files(
+                        repo_dir, existing_repo, repo_info, repo_info.file_hashes
+                    )
+                chunk_iter = self.chunker.chunk_repository(
+                    repository, repo_dir, files=text_files
+                )
+
+        # Step 3: Embed and store chunks as they are produced
+        if need_embedding and (chunk_iter is not None or not need_chunking):
             print(f"Embedding and storing chunks...")
             try:
-                if chunks:
-                    self.db.store_chunks(chunks)
-                    # Update repository info
-                    repo_info.num_chunks = len(chunks)
+                if chunk_iter is not None:
+                    # Stream chunks through in fixed-size batches so memory
+                    # stays bounded and embedding overlaps chunking
+                    num_chunks = 0
+                    for batch in _batched(chunk_iter, EMBED_BATCH_SIZE):
+                        self._embed_and_store(repository, batch, reusable_vectors)
+                        num_chunks += len(batch)
+                    print(f"Generated and stored {num_chunks} chunks.")
+                    if num_chunks:
+                        # Update repository info
+                        repo_info.num_chunks = num_chunks
+                    repo_info.chunking_successful = True
                 repo_info.embedding_successful = True
                 repo_info.last_indexed = datetime.datetime.now()
                 self.db.add_repository(repo_info)
             except Exception as e:
-                print(f"Error embedding repository: {e}")
+                print(f"Error chunking or embedding repository: {e}")
+                # A failure mid-stream leaves chunks partially stored, so both
+                # stages need to be redone on the next run
+                repo_info.chunking_successful = False
                 repo_info.embedding_successful = False
                 self.db.add_repository(repo_info)
-                raise
+                if not isinstance(e, UnicodeDecodeError):  # UnicodeDecodeError is expected for some files
+                    raise
         
         # Cleanup
         if temp_dir:
@@ -291,6 +424,251 @@ class SearchEngine:
         
         return repo_info
 
+    def _collect_text_files(
+        self,
+        repo_dir: Path,
+        existing_repo: Optional[RepositoryInfo],
+        repo_info: RepositoryInfo,
+        new_file_hashes: Dict[str, str],
+    ) -> List[Path]:
+        """Collect text files for chunking, reusing cached sniff results.
+
+        Files whose content hash is unchanged since the previous run keep
+        their cached is_text_file verdict, so a full walk only sniffs
+        files that are new or changed. The refreshed cache is recorded on
+        repo_info for the next run.
+
+        Args:
+            repo_dir: Directory containing the repository contents.
+            existing_repo: Stored repository info, if any.
+            repo_info: Repository info being built for this run.
+            new_file_hashes: Content hashes of the downloaded files.
+
+        Returns:
+            Paths of the text files under repo_dir.
+        """
+        old_cache = existing_repo.is_text_cache if existing_repo else {}
+        old_hashes = existing_repo.file_hashes if existing_repo else {}
+        is_text = {}
+        text_files = []
+        for file_path in repo_dir.glob("**/*"):
+            if not file_path.is_file():
+                continue
+            rel_path = str(file_path.relative_to(repo_dir))
+            verdict = old_cache.get(rel_path)
+            if verdict is None or new_file_hashes.get(rel_path) != old_hashes.get(rel_path):
+                verdict = self.repo_fetcher.is_text_file(file_path)
+            is_text[rel_path] = verdict
+            if verdict:
+                text_files.append(file_path)
+        repo_info.is_text_cache = is_text
+        return text_files
+
+    def _chunk_changed_files(
+        self,
+        repository: str,
+        repo_dir: Path,
+        files_to_chunk: Set[str],
+        is_text: Dict[str, bool],
+    ) -> Iterator[DocumentChunk]:
+        """Chunk changed files in parallel, yielding chunks as they complete.
+
+        Chunking is CPU-bound and independent per file, so files are fanned
+        out to worker processes and results are yielded as each finishes.
+
+        Args:
+            repository: Repository name in the format 'owner/name'.
+            repo_dir: Directory containing the repository contents.
+            files_to_chunk: Relative paths of files that need chunking.
+            is_text: Text-file sniff results keyed by relative path.
+
+        Yields:
+            Document chunks for the changed files.
+        """
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = {}
+            for file_path in files_to_chunk:
+                if is_text.get(file_path):
+                    if config.verbose:
+                        print(f"Chunking file: {file_path}")
+                    future = executor.submit(_chunk_one, repo_dir / file_path, repository)
+                    futures[future] = file_path
+
+            for future in as_completed(futures):
+                try:
+                    yield from future.result()
+                except UnicodeDecodeError:
+                    print(f"Skipping file with unsupported encoding: {futures[future]}")
+
+    def _embed_and_store(
+        self,
+        repository: str,
+        chunks: List[DocumentChunk],
+        reusable_vectors: Optional[Dict[str, List[float]]] = None,
+    ) -> None:
+        """Embed one batch of chunks and store them in the database.
+
+        Chunks whose content is already embedded in the database — or was
+        snapshotted from chunks deleted earlier in the same run — reuse the
+        stored vector instead of calling the embedding API again.
+
+        Args:
+            repository: Repository name in the format 'owner/name'.
+            chunks: Batch of chunks to embed and store.
+            reusable_vectors: Vectors keyed by content hash, snapshotted
+                from chunks that were deleted before re-chunking.
+        """
+        reusable_vectors = reusable_vectors or {}
+        # Hash chunk contents and skip the embedding API call for
+        # chunks whose content is already embedded in the database
+        for chunk in chunks:
+            chunk.metadata["content_hash"] = self._content_hash(chunk.content)
+        existing_hashes = self.db.get_existing_content_hashes(
+            repository, {chunk.metadata["content_hash"] for chunk in chunks}
+        )
+        chunks_to_copy = []
+        chunks_to_reuse = []
+        chunks_to_embed = []
+        for chunk in chunks:
+            content_hash = chunk.metadata["content_hash"]
+            if content_hash in existing_hashes:
+                chunks_to_copy.append(chunk)
+            elif content_hash in reusable_vectors:
+                chunks_to_reuse.append(chunk)
+            else:
+                chunks_to_embed.append(chunk)
+        if chunks_to_copy:
+            print(f"Reusing stored vectors for {len(chunks_to_copy)} unchanged chunks.")
+            self.db.copy_chunk_vectors(repository, chunks_to_copy)
+        if chunks_to_reuse:
+            print(f"Reusing snapshotted vectors for {len(chunks_to_reuse)} unchanged chunks.")
+            self.db.store_chunks_with_vectors(
+                chunks_to_reuse,
+                [
+                    reusable_vectors[chunk.metadata["content_hash"]]
+                    for chunk in chunks_to_reuse
+                ],
+            )
+        if chunks_to_embed:
+            texts = [chunk.content for chunk in chunks_to_embed]
+            vectors = self.embedder.embed_batch(texts)
+            self.db.store_chunks_with_vectors(chunks_to_embed, vectors)
+
+    @staticmethod
+    def _can_short_circuit(
+        existing: Optional[RepositoryInfo],
+        current: RepositoryInfo,
+        force_redownload: bool,
+        force_rechunk: bool,
+        force_reembed: bool,
+    ) -> bool:
+        """Check whether an index run can return the stored result untouched.
+
+        True when nothing is forced, every stage of the previous run
+        succeeded, and the stored tree or commit hash matches the current
+        one (equal trees mean identical content).
+
+        Args:
+            existing: Stored repository info, if any.
+            current: Freshly fetched repository info.
+            force_redownload: Whether a re-download was requested.
+            force_rechunk: Whether a re-chunk was requested.
+            force_reembed: Whether a re-embed was requested.
+
+        Returns:
+            True if the stored repository info can be returned as-is.
+        """
+        if existing is None or force_redownload or force_rechunk or force_reembed:
+            return False
+        if not (
+            existing.download_successful
+            and existing.chunking_successful
+            and existing.embedding_successful
+        ):
+            return False
+        if existing.tree_hash and existing.tree_hash == current.tree_hash:
+            return True
+        return bool(existing.commit_hash) and existing.commit_hash == current.commit_hash
+
+    def _repo_cache_path(self, commit_hash: str) -> Path:
+        """Get the cache tar path for a commit.
+
+        Args:
+            commit_hash: Commit hash the tree was downloaded at.
+
+        Returns:
+            Path to the cache tar for that commit.
+        """
+        return Path(self.db_path) / "repos" / f"{commit_hash}.tar"
+
+    def _cache_repo_tree(self, commit_hash: Optional[str], repo_dir: Path) -> None:
+        """Cache a downloaded repository tree keyed by commit hash.
+
+        A cache failure only costs a future re-download, so errors are
+        reported as warnings rather than raised.
+
+        Args:
+            commit_hash: Commit hash the tree was downloaded at.
+            repo_dir: Directory containing the repository contents.
+        """
+        if not commit_hash:
+            return
+        try:
+            cache_path = self._repo_cache_path(commit_hash)
+            cache_path.parent.mkdir(exist_ok=True, parents=True)
+            if not cache_path.exists():
+                with tarfile.open(cache_path, "w") as tar:
+                    tar.add(repo_dir, arcname=".")
+            self._evict_old_repo_caches()
+        except Exception as e:
+            print(f"Warning: Could not cache repository tree: {e}")
+
+    def _restore_repo_cache(self, commit_hash: str, dest_dir: Path) -> Optional[Path]:
+        """Restore a cached repository tree for a commit, if present.
+
+        Args:
+            commit_hash: Commit hash to look up.
+            dest_dir: Directory to extract the tree into.
+
+        Returns:
+            The destination directory on a cache hit, None otherwise.
+        """
+        cache_path = self._repo_cache_path(commit_hash)
+        try:
+            if not cache_path.exists():
+                return None
+            with tarfile.open(cache_path, "r") as tar:
+                tar.extractall(dest_dir)
+            # Refresh mtime so eviction keeps recently used caches
+            os.utime(cache_path)
+            return dest_dir
+        except Exception as e:
+            print(f"Warning: Could not restore repository cache: {e}")
+            return None
+
+    def _evict_old_repo_caches(self) -> None:
+        """Delete all but the most recently used cached repository trees."""
+        cache_dir = Path(self.db_path) / "repos"
+        tars = sorted(
+            cache_dir.glob("*.tar"),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        for stale in tars[REPO_CACHE_KEEP:]:
+            stale.unlink(missing_ok=True)
+
+    @staticmethod
+    def _content_hash(content: str) -> str:
+        """Compute a stable hash of chunk content for vector reuse.
+
+        Args:
+            content: Chunk content.
+
+        Returns:
+            Hex digest of the content.
+        """
+        return xxhash.xxh3_128_hexdigest(content.encode("utf-8"))
+
     def search(
         self,
         query: str,
@@ -1,24 +1,28 @@
 """Utility functions for RepoSearch."""
 
-import hashlib
 import textwrap
 from pathlib import Path
 from typing import Dict, List
 import colorama
+import xxhash
 from colorama import Fore, Style
 from repo_search.models import SearchResult
 
 
 def calculate_file_hash(file_path: Path) -> str:
-    """Calculate the SHA-256 hash of a file's contents.
-    
+    """Calculate a fast non-cryptographic hash of a file's contents.
+
+    Uses xxh3, which hashes at memory bandwidth; these hashes are only
+    compared against each other to detect changes, so cryptographic
+    strength is not needed.
+
     Args:
         file_path: Path to the file.
-        
+
     Returns:
-        SHA-256 hash of the file's contents as a hex string.
+        xxh3-128 hash of the file's contents as a hex string.
     """
-    hash_obj = hashlib.sha256()
+    hash_obj = xxhash.xxh3_128()
     try:
         with open(file_path, 'rb') as f:
             # Read and update hash in chunks for memory efficiency
@@ -1,21 +1,30 @@
 #!/usr/bin/env python
 """Test script for file-level change detection."""
 
+import os
 import sys
-from repo_search.api.client import RepoSearchClient
 
 def main():
     """Main function."""
-    # Initialize the client
-    client = RepoSearchClient()
-    
     # Parse command line arguments
-    if len(sys.argv) < 2:
-        print("Usage: python test_file_changes.py <repository>")
+    args = sys.argv[1:]
+    if "--test-mode" in args:
+        # Use a fake embedder and in-memory database (no network/disk I/O)
+        os.environ["REPOSEARCH_TEST"] = "1"
+        args = [arg for arg in args if arg != "--test-mode"]
+
+    if len(args) < 1:
+        print("Usage: python test_file_changes.py <repository> [--test-mode]")
         print("Example: python test_file_changes.py owner/repo")
         return
-    
-    repository = sys.argv[1]
+
+    # Import after REPOSEARCH_TEST is set so the engine picks up test mode
+    from repo_search.api.client import RepoSearchClient
+
+    # Initialize the client
+    client = RepoSearchClient()
+
+    repository = args[0]
     
     # Index the repository with file-level change detection
     print(f"Indexing repository: {repository}")
@@ -7,7 +7,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from repo_search.models import RepositoryInfo, DocumentChunk
+from repo_search.models import RepositoryInfo, DocumentChunk, SearchResult
 from repo_search.github.repository import GitHubRepositoryFetcher
 from repo_search.api.client import RepoSearchClient
 from repo_search.search.engine import SearchEngine
@@ -22,8 +22,25 @@ def temp_dir():
 
 
 @pytest.fixture
+def populate():
+    """Return a helper that writes a {relative path: content} spec to a directory.
+
+    Content may be str or bytes; parent directories are created as needed.
+    """
+    def _populate(directory, spec):
+        for rel_path, content in spec.items():
+            file_path = directory / rel_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                file_path.write_bytes(content)
+            else:
+                file_path.write_text(content)
+    return _populate
+
+
+@pytest.fixture(scope="session")
 def sample_repo_info():
-    """Create a sample repository info."""
+    """Create a sample repository info, validated once per session."""
     return RepositoryInfo(
         owner="test-owner",
         name="test-repo",
@@ -44,9 +61,38 @@ def sample_repo_info():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def sample_chunk():
+    """Create a single sample chunk with full metadata, validated once."""
+    return DocumentChunk(
+        id="test-owner/test-repo/path/to/file.py/1",
+        repository="test-owner/test-repo",
+        content="def test_function():\n    return 'test'",
+        metadata={
+            "file_path": "path/to/file.py",
+            "chunk_type": "code",
+            "start_line": 1,
+            "end_line": 2,
+        }
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_chunk_no_meta():
+    """Create a single sample chunk without metadata, validated once."""
+    return DocumentChunk(
+        id="test-owner/test-repo/path/to/file.py/1",
+        repository="test-owner/test-repo",
+        content="def test_function():\n    return 'test'",
+    )
+
+
+@pytest.fixture(scope="session")
 def sample_document_chunks(sample_repo_info):
-    """Create sample document chunks for testing."""
+    """Create sample document chunks once per session.
+
+    Returned as a tuple so no test can mutate the shared value.
+    """
     chunks = []
     repo_name = f"{sample_repo_info.owner}/{sample_repo_info.name}"
     
@@ -88,8 +134,51 @@ def sample_document_chunks(sample_repo_info):
             "end_line": 2,
         }
     ))
-    
-    return chunks
+
+    return tuple(chunks)
+
+
+@pytest.fixture(scope="session")
+def sample_search_results(sample_document_chunks):
+    """Create sample search results from the sample chunks, once per session.
+
+    Returned as a tuple so no test can mutate the shared value.
+    """
+    return tuple(SearchResult(chunk=chunk, score=0.9) for chunk in sample_document_chunks)
+
+
+@pytest.fixture(scope="session")
+def source_result_cases():
+    """Build (SearchResult, expected source string) pairs once per session."""
+    cases = [
+        (
+            {"file_path": "path/to/file.py", "start_line": 1, "end_line": 2},
+            "test-owner/test-repo - path/to/file.py:1-2",
+        ),
+        (
+            {"file_path": "path/to/file.py"},
+            "test-owner/test-repo - path/to/file.py",
+        ),
+        (
+            {},
+            "test-owner/test-repo",
+        ),
+    ]
+    return tuple(
+        (
+            SearchResult(
+                chunk=DocumentChunk(
+                    id="test-owner/test-repo/path/to/file.py/1",
+                    repository="test-owner/test-repo",
+                    content="def test_function():\n    return 'test'",
+                    metadata=metadata,
+                ),
+                score=0.85,
+            ),
+            expected,
+        )
+        for metadata, expected in cases
+    )
 
 
 @pytest.fixture
@@ -0,0 +1,52 @@
+"""Tests for the Chroma database's repository metadata handling."""
+
+import pytest
+
+from repo_search.database.chroma import ChromaVectorDatabase
+from repo_search.embedding.fake import FakeEmbedder
+from repo_search.models import RepositoryInfo
+
+
+class TestRepositoryMetadataSidecar:
+    """Test the add_repository/get_repository sidecar round-trip."""
+
+    @pytest.fixture
+    def db(self, temp_dir):
+        """Create a database backed by a temporary directory."""
+        return ChromaVectorDatabase(db_path=temp_dir, embedder=FakeEmbedder())
+
+    def test_round_trip(self, db):
+        """Test that file hashes and caches survive a store/load cycle."""
+        repo_info = RepositoryInfo(
+            owner="test-owner",
+            name="test-repo",
+            url="https://github.com/test-owner/test-repo",
+            commit_hash="abcd1234",
+            head_etag='"abc123"',
+            file_hashes={"README.md": "hash1", "src/main.py": "hash2"},
+            is_text_cache={"README.md": True, "logo.png": False},
+        )
+
+        db.add_repository(repo_info)
+        loaded = db.get_repository("test-owner/test-repo")
+
+        assert loaded is not None
+        assert loaded.commit_hash == "abcd1234"
+        assert loaded.head_etag == '"abc123"'
+        assert loaded.file_hashes == repo_info.file_hashes
+        assert loaded.is_text_cache == repo_info.is_text_cache
+
+    def test_delete_removes_sidecar(self, db, temp_dir):
+        """Test that deleting a repository also drops its sidecar data."""
+        repo_info = RepositoryInfo(
+            owner="test-owner",
+            name="test-repo",
+            url="https://github.com/test-owner/test-repo",
+            file_hashes={"README.md": "hash1"},
+        )
+        db.add_repository(repo_info)
+
+        db.delete_repository("test-owner/test-repo")
+
+        assert db.get_repository("test-owner/test-repo") is None
+        assert db.file_hash_store.get("test-owner/test-repo") == {}
@@ -0,0 +1,63 @@
+"""Tests for the file hash sidecar store."""
+
+import pytest
+
+from repo_search.database.file_hash_store import FileHashStore
+
+
+class TestFileHashStore:
+    """Test the FileHashStore class."""
+
+    SAMPLE_DATA = {
+        "file_hashes": {"README.md": "hash1", "src/main.py": "hash2"},
+    }
+
+    def test_put_get_roundtrip(self, temp_dir):
+        """Test storing and reading back a repository's data."""
+        store = FileHashStore(temp_dir)
+        store.put("test-owner/test-repo", self.SAMPLE_DATA)
+
+        assert store.get("test-owner/test-repo") == self.SAMPLE_DATA
+
+    def test_get_missing_repository(self, temp_dir):
+        """Test reading a repository that was never stored."""
+        store = FileHashStore(temp_dir)
+
+        assert store.get("test-owner/test-repo") == {}
+
+    def test_delete(self, temp_dir):
+        """Test deleting a repository's data."""
+        store = FileHashStore(temp_dir)
+        store.put("test-owner/test-repo", self.SAMPLE_DATA)
+
+        store.delete("test-owner/test-repo")
+
+        assert store.get("test-owner/test-repo") == {}
+        # Deleting again is a no-op rather than an error
+        store.delete("test-owner/test-repo")
+
+    def test_sidecar_path_mapping(self, temp_dir):
+        """Test that 'owner/name' maps to an owner__name.json sidecar."""
+        store = FileHashStore(temp_dir)
+        store.put("test-owner/test-repo", self.SAMPLE_DATA)
+
+        sidecar = temp_dir / "file_hashes" / "test-owner__test-repo.json"
+        assert sidecar.is_file()
+
+    def test_unreadable_sidecar_falls_back_to_empty(self, temp_dir, populate):
+        """Test that a corrupt sidecar reads as empty instead of raising."""
+        store = FileHashStore(temp_dir)
+        populate(temp_dir, {
+            "file_hashes/test-owner__test-repo.json": "{not valid json",
+        })
+
+        assert store.get("test-owner/test-repo") == {}
+
+    def test_in_memory_mode(self):
+        """Test that a store without a base path keeps data in memory only."""
+        store = FileHashStore(None)
+        store.put("test-owner/test-repo", self.SAMPLE_DATA)
+
+        assert store.get("test-owner/test-repo") == self.SAMPLE_DATA
+        store.delete("test-owner/test-repo")
+        assert store.get("test-owner/test-repo") == {}
@@ -1,72 +1,90 @@
 """Tests for the GitHub repository module."""
 
 import os
+import subprocess
 import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch, PropertyMock, call
 
 import pytest
-from github.ContentFile import ContentFile
-from github.Repository import Repository
 
-from repo_search.github.repository import GitHubRepositoryFetcher
+from repo_search.github.repository import BareGitFetcher, GitHubRepositoryFetcher
 from repo_search.models import RepositoryInfo
 
 
 class TestGitHubRepositoryFetcher:
     """Test the GitHubRepositoryFetcher class."""
 
-    def test_initialization_no_token(self):
+    @pytest.fixture(autouse=True)
+    def mock_github(self, monkeypatch):
+        """Install one Github class mock per test via monkeypatch.
+
+        Cheaper than entering a unittest.mock.patch context manager in
+        every test, and every test in this class wants it anyway.
+        """
+        mock = MagicMock()
+        monkeypatch.setattr('repo_search.github.repository.Github', mock)
+        return mock
+
+    @pytest.fixture
+    def temp_dir(self, fs):
+        """Override the shared temp_dir with an in-memory pyfakefs directory.
+
+        File reads and writes in these tests resolve against an in-process
+        fake filesystem instead of real syscalls.
+        """
+        fs.create_dir("/tmp/rs")
+        return Path("/tmp/rs")
+
+    def test_initialization_no_token(self, mock_github, monkeypatch):
         """Test initialization without a token."""
-        with patch('repo_search.github.repository.Github') as mock_github, \
-             patch('repo_search.github.repository.config') as mock_config:
-            # Set config token to None to simulate no token
-            mock_config.github_token = None
-            
-            fetcher = GitHubRepositoryFetcher()
-            mock_github.assert_called_once_with()
-            assert fetcher.token is None
-            assert fetcher.github == mock_github.return_value
+        # Set config token to None to simulate no token
+        monkeypatch.setattr('repo_search.github.repository.config.github_token', None)
 
-    def test_initialization_with_token(self):
+        fetcher = GitHubRepositoryFetcher()
+        mock_github.assert_called_once_with()
+        assert fetcher.token is None
+        assert fetcher.github == mock_github.return_value
+
+    def test_initialization_with_token(self, mock_github):
         """Test initialization with a token."""
-        with patch('repo_search.github.repository.Github') as mock_github:
-            fetcher = GitHubRepositoryFetcher(token="test-token")
-            mock_github.assert_called_once_with("test-token")
-            assert fetcher.token == "test-token"
-            assert fetcher.github == mock_github.return_value
+        fetcher = GitHubRepositoryFetcher(token="test-token")
+        mock_github.assert_called_once_with("test-token")
+        assert fetcher.token == "test-token"
+        assert fetcher.github == mock_github.return_value
 
-    def test_get_repository_info(self):
+    def test_get_repository_info(self, mock_github):
         """Test getting repository information."""
-        with patch('repo_search.github.repository.Github') as mock_github:
-            # Setup mock repository
-            mock_repo = MagicMock(spec=Repository)
-            mock_repo.html_url = "https://github.com/test-owner/test-repo"
-            
-            # Setup mock commit
-            mock_commit = MagicMock()
-            mock_commit.sha = "abcd1234"
-            
-            # Set up mock repository to return our mock commit
-            mock_repo.get_commits.return_value = [mock_commit]
-            
-            # Set up GitHub client to return our mock repository
-            mock_github_instance = mock_github.return_value
-            mock_github_instance.get_repo.return_value = mock_repo
-            
-            fetcher = GitHubRepositoryFetcher()
-            result = fetcher.get_repository_info("test-owner/test-repo")
-            
-            # Verify the repository was fetched correctly
-            mock_github_instance.get_repo.assert_called_once_with("test-owner/test-repo")
-            mock_repo.get_commits.assert_called_once()
-            
-            # Verify the returned repository info is correct
-            assert isinstance(result, RepositoryInfo)
-            assert result.owner == "test-owner"
-            assert result.name == "test-repo"
-            assert result.url == "https://github.com/test-owner/test-repo"
-            assert result.commit_hash == "abcd1234"
+        # Setup mock repository; no spec, the test only uses two attributes
+        mock_repo = MagicMock()
+        mock_repo.html_url = "https://github.com/test-owner/test-repo"
+
+        # Setup mock commit
+        mock_commit = MagicMock()
+        mock_commit.sha = "abcd1234"
+        mock_commit.commit.tree.sha = "efgh5678"
+
+        # Set up mock repository to return our mock commit
+        mock_repo.get_commits.return_value = [mock_commit]
+
+        # Set up GitHub client to return our mock repository
+        mock_github_instance = mock_github.return_value
+        mock_github_instance.get_repo.return_value = mock_repo
+
+        fetcher = GitHubRepositoryFetcher()
+        result = fetcher.get_repository_info("test-owner/test-repo")
+
+        # Verify the repository was fetched correctly
+        mock_github_instance.get_repo.assert_called_once_with("test-owner/test-repo")
+        mock_repo.get_commits.assert_called_once()
+
+        # Verify the returned repository info is correct
+        assert isinstance(result, RepositoryInfo)
+        assert result.owner == "test-owner"
+        assert result.name == "test-repo"
+        assert result.url == "https://github.com/test-owner/test-repo"
+        assert result.commit_hash == "abcd1234"
+        assert result.tree_hash == "efgh5678"
 
     def test_get_repository_info_invalid_name(self):
         """Test getting repository information with an invalid repository name."""
@@ -75,78 +93,99 @@ class TestGitHubRepositoryFetcher:
         with pytest.raises(ValueError, match="Invalid repository name"):
             fetcher.get_repository_info("invalid-repo-name")
 
-    def test_get_repository_info_not_found(self):
+    def test_get_repository_info_not_found(self, mock_github):
         """Test getting repository information when the repository is not found."""
-        with patch('repo_search.github.repository.Github') as mock_github:
-            # Set up GitHub client to raise an exception
-            mock_github_instance = mock_github.return_value
-            mock_github_instance.get_repo.side_effect = Exception("Repository not found")
-            
+        # Set up GitHub client to raise an exception
+        mock_github.return_value.get_repo.side_effect = Exception("Repository not found")
+
+        fetcher = GitHubRepositoryFetcher()
+
+        with pytest.raises(ValueError, match="Error accessing repository"):
+            fetcher.get_repository_info("test-owner/test-repo")
+
+    def test_get_repository_info_conditional_not_modified(self):
+        """Test the conditional fetch when the repository HEAD is unchanged."""
+        with patch('repo_search.github.repository.requests.get') as mock_get:
+            mock_response = MagicMock()
+            mock_response.status_code = 304
+            mock_get.return_value = mock_response
+
             fetcher = GitHubRepositoryFetcher()
-            
-            with pytest.raises(ValueError, match="Error accessing repository"):
-                fetcher.get_repository_info("test-owner/test-repo")
+            result = fetcher.get_repository_info_conditional(
+                "test-owner/test-repo", etag='"abc123"'
+            )
+
+            # A 304 means nothing changed, signalled by None
+            assert result is None
+            headers = mock_get.call_args.kwargs["headers"]
+            assert headers["If-None-Match"] == '"abc123"'
+
+    def test_get_repository_info_conditional_changed(self):
+        """Test the conditional fetch when the repository HEAD has changed."""
+        with patch('repo_search.github.repository.requests.get') as mock_get:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.headers = {"ETag": '"def456"'}
+            mock_response.json.return_value = {
+                "sha": "abcd1234",
+                "commit": {"tree": {"sha": "efgh5678"}},
+            }
+            mock_get.return_value = mock_response
+
+            fetcher = GitHubRepositoryFetcher()
+            result = fetcher.get_repository_info_conditional("test-owner/test-repo")
 
-    def test_fetch_repository_contents(self, temp_dir):
+            assert isinstance(result, RepositoryInfo)
+            assert result.commit_hash == "abcd1234"
+            assert result.tree_hash == "efgh5678"
+            assert result.head_etag == '"def456"'
+
+    def test_fetch_repository_contents(self, temp_dir, sample_repo_info):
         """Test fetching repository contents."""
         with patch.object(GitHubRepositoryFetcher, 'get_repository_info') as mock_get_info, \
              patch.object(GitHubRepositoryFetcher, '_download_repository') as mock_download:
-            
-            # Setup mock repository info
-            mock_repo_info = RepositoryInfo(
-                owner="test-owner",
-                name="test-repo",
-                url="https://github.com/test-owner/test-repo",
-                commit_hash="abcd1234"
-            )
-            mock_get_info.return_value = mock_repo_info
-            
+
+            mock_get_info.return_value = sample_repo_info
+
             fetcher = GitHubRepositoryFetcher()
             result_info, result_dir = fetcher.fetch_repository_contents("test-owner/test-repo", temp_dir)
-            
+
             # Verify the repository info was fetched correctly
             mock_get_info.assert_called_once_with("test-owner/test-repo")
-            
+
             # Verify the repository was downloaded correctly
-            mock_download.assert_called_once_with(mock_repo_info, temp_dir)
-            
+            mock_download.assert_called_once_with(sample_repo_info, temp_dir)
+
             # Verify the returned values
-            assert result_info == mock_repo_info
+            assert result_info == sample_repo_info
             assert result_dir == temp_dir
 
-    def test_fetch_repository_contents_temp_dir(self):
+    def test_fetch_repository_contents_temp_dir(self, sample_repo_info):
         """Test fetching repository contents with a temporary directory."""
         with patch.object(GitHubRepositoryFetcher, 'get_repository_info') as mock_get_info, \
              patch.object(GitHubRepositoryFetcher, '_download_repository') as mock_download, \
              patch('tempfile.mkdtemp') as mock_mkdtemp:
-            
-            # Setup mock repository info
-            mock_repo_info = RepositoryInfo(
-                owner="test-owner",
-                name="test-repo",
-                url="https://github.com/test-owner/test-repo",
-                commit_hash="abcd1234"
-            )
-            mock_get_info.return_value = mock_repo_info
-            
+
+            mock_get_info.return_value = sample_repo_info
+
             # Setup mock temp directory
             mock_temp_dir = "/tmp/test-owner_test-repo_123456"
             mock_mkdtemp.return_value = mock_temp_dir
-            
+
             fetcher = GitHubRepositoryFetcher()
             result_info, result_dir = fetcher.fetch_repository_contents("test-owner/test-repo")
-            
+
             # Verify the repository info was fetched correctly
             mock_get_info.assert_called_once_with("test-owner/test-repo")
-            
+
             # Verify the temporary directory was created correctly
             mock_mkdtemp.assert_called_once_with(prefix="test-owner_test-repo_")
-            
+
             # Verify the repository was downloaded correctly
-            mock_download.assert_called_once_with(mock_repo_info, Path(mock_temp_dir))
-            
+            mock_download.assert_called_once_with(sample_repo_info, Path(mock_temp_dir))
+
             # Verify the returned values
-            assert result_info == mock_repo_info
+            assert result_info == sample_repo_info
             assert result_dir == Path(mock_temp_dir)
 
     def test_is_text_file_true(self, temp_dir):
@@ -182,20 +221,19 @@ class TestGitHubRepositoryFetcher:
         
         assert result is False
 
-    def test_get_text_files(self, temp_dir):
+    def test_get_text_files(self, temp_dir, populate):
         """Test getting all text files in a directory."""
-        # Create some test files
-        (temp_dir / "test.txt").write_text("Text file 1")
-        (temp_dir / "test.md").write_text("Text file 2")
-        (temp_dir / "test.py").write_text("def test(): return True")
-        (temp_dir / "test.bin").write_bytes(b'\x00\x01\x02\x03')
-        
-        # Create a subdirectory with some more files
-        subdir = temp_dir / "subdir"
-        subdir.mkdir()
-        (subdir / "test2.txt").write_text("Text file in subdir")
-        (subdir / "test2.bin").write_bytes(b'\x04\x05\x06\x07')
-        
+        # Create the test tree in one declarative spec
+        populate(temp_dir, {
+            "test.txt": "Text file 1",
+            "test.md": "Text file 2",
+            "test.py": "def test(): return True",
+            "test.bin": b'\x00\x01\x02\x03',
+            "subdir/test2.txt": "Text file in subdir",
+            "subdir/test2.bin": b'\x04\x05\x06\x07',
+        })
+
+
         with patch.object(GitHubRepositoryFetcher, 'is_text_file') as mock_is_text:
             # Configure the mock to return True for text files
             def is_text_side_effect(path):
@@ -218,3 +256,82 @@ class TestGitHubRepositoryFetcher:
             assert Path("test.md") in paths
             assert Path("test.py") in paths
             assert Path("subdir/test2.txt") in paths
+
+
+class TestBareGitFetcher:
+    """Test the BareGitFetcher class."""
+
+    FIXTURE_FILES = {
+        "README.md": "# Fixture repository\n",
+        "src/main.py": "def main():\n    print('Hello, world!')\n",
+    }
+
+    @pytest.fixture
+    def bare_repo(self, temp_dir, populate):
+        """Create a local bare clone of a small fixture repository."""
+        source_dir = temp_dir / "source"
+        source_dir.mkdir()
+        populate(source_dir, self.FIXTURE_FILES)
+
+        def git(*args):
+            subprocess.run(
+                ["git", "-c", "user.email=test@example.com", "-c", "user.name=Test", *args],
+                cwd=source_dir,
+                check=True,
+                capture_output=True,
+            )
+
+        git("init", "-q")
+        git("add", "-A")
+        git("commit", "-q", "-m", "fixture")
+
+        clone_dir = temp_dir / "bare.git"
+        subprocess.run(
+            ["git", "clone", "-q", "--bare", str(source_dir), str(clone_dir)],
+            check=True,
+            capture_output=True,
+        )
+        return clone_dir
+
+    def test_ls_tree(self, bare_repo):
+        """Test listing the blobs of HEAD in a bare clone."""
+        fetcher = BareGitFetcher()
+        entries = fetcher._ls_tree(bare_repo)
+
+        assert {rel_path for rel_path, _sha in entries} == set(self.FIXTURE_FILES)
+        for _rel_path, sha in entries:
+            assert len(sha) == 40
+            assert all(c in "0123456789abcdef" for c in sha)
+
+    def test_iter_files(self, bare_repo):
+        """Test reading file contents out of the object store."""
+        fetcher = BareGitFetcher()
+        files = {
+            rel_path: (blob_sha, content)
+            for rel_path, blob_sha, content in fetcher.iter_files(bare_repo)
+        }
+
+        assert set(files) == set(self.FIXTURE_FILES)
+        shas_by_path = dict(fetcher._ls_tree(bare_repo))
+        for rel_path, expected_content in self.FIXTURE_FILES.items():
+            blob_sha, content = files[rel_path]
+            assert content == expected_content.encode()
+            assert blob_sha == shas_by_path[rel_path]
+
+    def test_clone_bare_keeps_token_off_command_line(self, monkeypatch):
+        """Test that the clone command never embeds the token itself."""
+        monkeypatch.setattr('repo_search.github.repository.Github', MagicMock())
+        with patch('repo_search.github.repository.subprocess.run') as mock_run:
+            fetcher = BareGitFetcher(token="secret-token")
+            repo_info = RepositoryInfo(
+                owner="test-owner",
+                name="test-repo",
+                url="https://github.com/test-owner/test-repo",
+            )
+
+            fetcher._clone_bare(repo_info, Path("/tmp/clone.git"))
+
+            cmd = mock_run.call_args.args[0]
+            assert all("secret-token" not in arg for arg in cmd)
+            env = mock_run.call_args.kwargs["env"]
+            assert env["REPOSEARCH_GIT_PASSWORD"] == "secret-token"
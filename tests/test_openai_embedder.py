@@ -0,0 +1,53 @@
+"""Tests for the OpenAI embedder module."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from repo_search.embedding.openai import OpenAIEmbedder
+
+
+class TestOpenAIEmbedder:
+    """Test the OpenAIEmbedder class."""
+
+    @pytest.fixture
+    def embedder(self):
+        """Create an embedder with a small batch size and a mocked client."""
+        embedder = OpenAIEmbedder(api_key="test-key", batch_size=2)
+        embedder.client = Mock()
+        return embedder
+
+    def test_embed_batch_single_call(self, embedder):
+        """Test that a batch within batch_size uses one synchronous call."""
+        response = Mock()
+        response.data = [Mock(embedding=[0.1]), Mock(embedding=[0.2])]
+        embedder.client.embeddings.create.return_value = response
+
+        result = embedder.embed_batch(["a", "b"])
+
+        embedder.client.embeddings.create.assert_called_once()
+        assert result == [[0.1], [0.2]]
+
+    def test_embed_batch_oversized(self, embedder):
+        """Test that an oversized batch is split and embedded concurrently."""
+        embedder.embed_batches_async = AsyncMock(
+            return_value=[[[0.1], [0.2]], [[0.3]]]
+        )
+
+        result = embedder.embed_batch(["a", "b", "c"])
+
+        embedder.embed_batches_async.assert_called_once_with([["a", "b"], ["c"]])
+        assert result == [[0.1], [0.2], [0.3]]
+
+    async def test_embed_batch_oversized_inside_running_loop(self, embedder):
+        """Test that the concurrent path works from inside a running event loop.
+
+        The MCP server calls indexing (and thus embed_batch) from an async
+        handler, where a bare asyncio.run() would raise RuntimeError.
+        """
+        embedder.embed_batches_async = AsyncMock(
+            return_value=[[[0.1], [0.2]], [[0.3]]]
+        )
+
+        result = embedder.embed_batch(["a", "b", "c"])
+
+        assert result == [[0.1], [0.2], [0.3]]